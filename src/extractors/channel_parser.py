@@ -1,10 +1,9 @@
 thonimport logging
-from typing import Any, Dict, List, Optional
-from urllib.parse import urljoin
+from typing import Any, Dict, FrozenSet, List, Optional
 
 from bs4 import BeautifulSoup
 
-from utils.helpers import fetch_url, parse_number
+from extractors.listing_parser import extract_listing_records
 
 logger = logging.getLogger("extractors.channel")
 
@@ -14,77 +13,26 @@ def _extract_channel_name(soup: BeautifulSoup) -> Optional[str]:
         return heading.get_text(strip=True)
     return None
 
-def _extract_video_cards(soup: BeautifulSoup) -> List[Any]:
-    """
-    Rumble uses a few different layouts. Here we try to grab any
-    anchor element that looks like a video card (contains `/v`).
-    """
-    cards = []
-    for a in soup.select("a[href*='/v']"):
-        cards.append(a)
-    return cards
-
-def extract_channel(
-    url: str, config: Optional[Dict[str, Any]] = None, max_videos: int = 50
+def parse_channel_page(
+    content: bytes,
+    encoding: Optional[str],
+    url: str,
+    max_videos: int = 50,
+    fields: Optional[FrozenSet[str]] = None,
 ) -> List[Dict[str, Any]]:
-    """
-    Extract videos listed on a channel page.
-
-    Since the main output schema is video-centric, this returns
-    a list of video records enriched with channel details.
-    """
-    cfg = config or {}
-    http_cfg = cfg.get("http", {})
-    scraper_cfg = cfg.get("scraper", {})
-
-    max_videos = int(scraper_cfg.get("max_videos_per_channel", max_videos))
+    """Parse a downloaded channel page into video records."""
+    soup = BeautifulSoup(content, "lxml", from_encoding=encoding)
+    channel_name = _extract_channel_name(soup) or "Unknown channel"
 
-    html = fetch_url(
+    records = extract_listing_records(
+        soup,
         url,
-        headers=http_cfg.get("headers"),
-        proxies=http_cfg.get("proxy"),
-        timeout=http_cfg.get("timeout", 15),
-        max_retries=http_cfg.get("max_retries", 3),
+        max_items=max_videos,
+        fields=fields,
+        views_scope="card",
+        defaults={"channelName": channel_name, "channelUrl": url},
     )
 
-    soup = BeautifulSoup(html, "lxml")
-    channel_name = _extract_channel_name(soup) or "Unknown channel"
-
-    records: List[Dict[str, Any]] = []
-    cards = _extract_video_cards(soup)
-    logger.info("Found %s potential video cards on channel page", len(cards))
-
-    for card in cards:
-        href = card.get("href")
-        if not href:
-            continue
-
-        video_url = urljoin(url, href)
-        title = card.get("title") or card.get_text(strip=True) or video_url
-
-        views_span = card.select_one(".views, .video-item--views")
-        views_text = views_span.get_text(strip=True) if views_span else None
-        views = parse_number(views_text) if views_text else None
-
-        record: Dict[str, Any] = {
-            "videoTitle": title,
-            "videoUrl": video_url,
-            "channelName": channel_name,
-            "channelUrl": url,
-            "views": views,
-            "likes": None,
-            "comments": None,
-            "revenue": None,
-            "uploadDate": None,
-            "description": None,
-            "playlistName": None,
-            "searchKeyword": None,
-            "trendingCategory": None,
-        }
-        records.append(record)
-        if len(records) >= max_videos:
-            break
-
     logger.info(
         "Extracted %s records from channel %s (%s)", len(records), channel_name, url
     )
@@ -0,0 +1,160 @@
+import logging
+from typing import Any, Dict, FrozenSet, List, Optional
+from urllib.parse import urljoin
+
+from bs4 import Tag
+
+from utils.helpers import RECORD_FIELDS, parse_number, wants_field
+
+logger = logging.getLogger("extractors.listing")
+
+# Elements search results are wrapped in; see `ListingIndex.wrapper`.
+WRAPPER_TAGS = frozenset({"article", "li", "div"})
+VIEWS_CLASSES = frozenset({"views", "video-item--views"})
+
+def _is_card(el: Tag) -> bool:
+    # Equivalent to the `a[href*='/v']` selector.
+    return el.name == "a" and "/v" in (el.get("href") or "")
+
+def _is_channel_link(el: Tag) -> bool:
+    # Equivalent to `a[href*='/c/'], a[href*='/user/']`.
+    if el.name != "a":
+        return False
+    href = el.get("href") or ""
+    return "/c/" in href or "/user/" in href
+
+def _is_views(el: Tag) -> bool:
+    # Equivalent to `.views, .video-item--views`.
+    return not VIEWS_CLASSES.isdisjoint(el.get("class") or ())
+
+class ListingIndex:
+    """
+    One-pass index of a listing page (channel, playlist or search results).
+
+    Walking the document once records every video card plus, for each
+    element, the first channel link and views span below it. Per-card
+    lookups are then dictionary hits instead of a `select_one` per card,
+    so a page with thousands of cards parses in linear time.
+    """
+
+    def __init__(self, root: Tag) -> None:
+        self.cards: List[Tag] = []
+        # id(element) -> first matching descendant, in document order.
+        self._channel_links: Dict[int, Tag] = {}
+        self._views: Dict[int, Tag] = {}
+        # id(element) -> nearest wrapper at or above it (or None).
+        self._wrappers: Dict[int, Optional[Tag]] = {}
+
+        for el in root.find_all(True):
+            if _is_card(el):
+                self.cards.append(el)
+            if _is_channel_link(el):
+                self._register(el, self._channel_links)
+            if _is_views(el):
+                self._register(el, self._views)
+
+    @staticmethod
+    def _register(el: Tag, table: Dict[int, Tag]) -> None:
+        # Elements arrive in document order, so the first match below an
+        # ancestor wins. Once an ancestor is taken, everything above it is
+        # too, which keeps the total work linear.
+        node = el.parent
+        while node is not None and id(node) not in table:
+            table[id(node)] = el
+            node = node.parent
+
+    def channel_link(self, scope: Optional[Tag]) -> Optional[Tag]:
+        """First channel link inside `scope`, like `scope.select_one(...)`."""
+        return self._channel_links.get(id(scope)) if scope is not None else None
+
+    def views_span(self, scope: Optional[Tag]) -> Optional[Tag]:
+        """First views element inside `scope`, like `scope.select_one(...)`."""
+        return self._views.get(id(scope)) if scope is not None else None
+
+    def wrapper(self, card: Tag) -> Optional[Tag]:
+        """Nearest `article`/`li`/`div` strictly above `card`."""
+        path: List[Tag] = []
+        node = card.parent
+        found: Optional[Tag] = None
+        while node is not None:
+            if id(node) in self._wrappers:
+                found = self._wrappers[id(node)]
+                break
+            if node.name in WRAPPER_TAGS:
+                found = node
+                break
+            path.append(node)
+            node = node.parent
+        for visited in path:
+            self._wrappers[id(visited)] = found
+        return found
+
+def extract_listing_records(
+    root: Tag,
+    url: str,
+    max_items: int,
+    fields: Optional[FrozenSet[str]] = None,
+    channel_scope: Optional[str] = None,
+    views_scope: str = "card",
+    defaults: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Turn every video card under `root` into a record in a single traversal.
+
+    `channel_scope` and `views_scope` say where a card's channel link and
+    views count live: inside the card itself (``"card"``), its parent
+    (``"parent"``) or its nearest wrapper element (``"wrapper"``). With no
+    `channel_scope`, channel fields come from `defaults` only. `defaults`
+    fills the remaining record fields (e.g. `playlistName`).
+    """
+    index = ListingIndex(root)
+    logger.info("Found %s potential video cards on listing page", len(index.cards))
+
+    want_channel = channel_scope is not None and (
+        wants_field(fields, "channelName") or wants_field(fields, "channelUrl")
+    )
+    want_views = wants_field(fields, "views")
+
+    def scope_of(card: Tag, scope: Optional[str]) -> Optional[Tag]:
+        if scope == "card":
+            return card
+        if scope == "parent":
+            return card.parent
+        if scope == "wrapper":
+            return index.wrapper(card)
+        return None
+
+    records: List[Dict[str, Any]] = []
+    for card in index.cards:
+        href = card.get("href")
+        if not href:
+            continue
+
+        video_url = urljoin(url, href)
+        record: Dict[str, Any] = dict.fromkeys(RECORD_FIELDS)
+        record.update(defaults or {})
+        record["videoUrl"] = video_url
+
+        if wants_field(fields, "videoTitle"):
+            record["videoTitle"] = (
+                card.get("title") or card.get_text(strip=True) or video_url
+            )
+
+        if want_channel:
+            ch_link = index.channel_link(scope_of(card, channel_scope))
+            if ch_link:
+                if wants_field(fields, "channelName") and ch_link.get_text(strip=True):
+                    record["channelName"] = ch_link.get_text(strip=True)
+                if wants_field(fields, "channelUrl") and ch_link.get("href"):
+                    record["channelUrl"] = urljoin(url, ch_link["href"])
+
+        if want_views:
+            views_span = index.views_span(scope_of(card, views_scope))
+            views_text = views_span.get_text(strip=True) if views_span else None
+            record["views"] = parse_number(views_text) if views_text else None
+
+        records.append(record)
+        if len(records) >= max_items:
+            break
+
+    return records
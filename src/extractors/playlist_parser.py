@@ -1,10 +1,9 @@
 thonimport logging
-from typing import Any, Dict, List, Optional
-from urllib.parse import urljoin
+from typing import Any, Dict, FrozenSet, List, Optional
 
 from bs4 import BeautifulSoup
 
-from utils.helpers import fetch_url, parse_number
+from extractors.listing_parser import extract_listing_records
 
 logger = logging.getLogger("extractors.playlist")
 
@@ -14,83 +13,32 @@ def _extract_playlist_name(soup: BeautifulSoup) -> Optional[str]:
         return heading.get_text(strip=True)
     return None
 
-def extract_playlist(
+def parse_playlist_page(
+    content: bytes,
+    encoding: Optional[str],
     url: str,
-    config: Optional[Dict[str, Any]] = None,
     max_videos: int = 100,
+    fields: Optional[FrozenSet[str]] = None,
 ) -> List[Dict[str, Any]]:
-    """
-    Extract videos from a playlist page.
-
-    Outputs a list of video records tagged with `playlistName`.
-    """
-    cfg = config or {}
-    http_cfg = cfg.get("http", {})
-    scraper_cfg = cfg.get("scraper", {})
-
-    max_videos = int(scraper_cfg.get("max_videos_per_playlist", max_videos))
-
-    html = fetch_url(
-        url,
-        headers=http_cfg.get("headers"),
-        proxies=http_cfg.get("proxy"),
-        timeout=http_cfg.get("timeout", 15),
-        max_retries=http_cfg.get("max_retries", 3),
-    )
-    soup = BeautifulSoup(html, "lxml")
+    """Parse a downloaded playlist page into video records."""
+    soup = BeautifulSoup(content, "lxml", from_encoding=encoding)
     playlist_name = _extract_playlist_name(soup) or "Rumble Playlist"
 
-    records: List[Dict[str, Any]] = []
-
     # Attempt to find any video cards inside the playlist container.
     playlist_container = soup.select_one(
         ".playlist-items, .video-list, .items-list"
     ) or soup
 
-    for card in playlist_container.select("a[href*='/v']"):
-        href = card.get("href")
-        if not href:
-            continue
-
-        video_url = urljoin(url, href)
-        title = card.get("title") or card.get_text(strip=True) or video_url
-
-        # We might be able to pick up channel info from sibling elements.
-        channel_name = None
-        channel_link = None
-        parent = card.parent
-        if parent:
-            channel_link = parent.select_one("a[href*='/c/'], a[href*='/user/']")
-        if channel_link and channel_link.get_text(strip=True):
-            channel_name = channel_link.get_text(strip=True)
-        channel_url = (
-            urljoin(url, channel_link["href"])
-            if channel_link and channel_link.get("href")
-            else None
-        )
-
-        views_span = card.select_one(".views, .video-item--views")
-        views_text = views_span.get_text(strip=True) if views_span else None
-        views = parse_number(views_text) if views_text else None
-
-        record: Dict[str, Any] = {
-            "videoTitle": title,
-            "videoUrl": video_url,
-            "channelName": channel_name,
-            "channelUrl": channel_url,
-            "views": views,
-            "likes": None,
-            "comments": None,
-            "revenue": None,
-            "uploadDate": None,
-            "description": None,
-            "playlistName": playlist_name,
-            "searchKeyword": None,
-            "trendingCategory": None,
-        }
-        records.append(record)
-        if len(records) >= max_videos:
-            break
+    # Channel info, when present, sits next to the card in its parent element.
+    records = extract_listing_records(
+        playlist_container,
+        url,
+        max_items=max_videos,
+        fields=fields,
+        channel_scope="parent",
+        views_scope="card",
+        defaults={"playlistName": playlist_name},
+    )
 
     logger.info(
         "Extracted %s playlist records from %s (%s)",
@@ -1,13 +1,28 @@
 thonimport logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
 from urllib.parse import urljoin
 
 from bs4 import BeautifulSoup
 
-from utils.helpers import fetch_url, parse_number
+from utils.helpers import (
+    fetch_page,
+    fetch_url_streaming,
+    parse_number,
+    wants_field,
+)
 
 logger = logging.getLogger("extractors.video")
 
+# <head> meta tags backing each field, in the order parse_video_html tries them.
+META_FIELD_KEYS: Dict[str, Tuple[str, ...]] = {
+    "videoTitle": ("og:title",),
+    "description": ("og:description",),
+    "uploadDate": ("article:published_time", "og:video:release_date", "date"),
+}
+
+# Fields filled from the input item rather than from the page itself.
+INPUT_FIELDS = frozenset({"videoUrl", "playlistName", "searchKeyword", "trendingCategory"})
+
 def _get_meta_content(soup: BeautifulSoup, key: str) -> Optional[str]:
     meta = soup.find("meta", attrs={"property": key}) or soup.find(
         "meta", attrs={"name": key}
@@ -23,77 +38,135 @@ def _get_first_text(soup: BeautifulSoup, selectors: List[str]) -> Optional[str]:
             return el.get_text(strip=True)
     return None
 
+def _head_stop_condition(
+    fields: Optional[FrozenSet[str]],
+) -> Optional[Callable[[str, Any], bool]]:
+    """
+    Build a `fetch_url_streaming` stop condition for meta-only field sets.
+
+    Returns None when a requested field may need the page body. The download
+    stops once every field's preferred meta tag has been seen, or at the end
+    of `<head>` if each field has at least one of its tags by then; otherwise
+    the whole page is read so body fallbacks (e.g. `h1` for the title) work.
+    """
+    if fields is None:
+        return None
+    page_fields = fields - INPUT_FIELDS
+    if not page_fields.issubset(META_FIELD_KEYS):
+        return None
+
+    wanted = [META_FIELD_KEYS[name] for name in page_fields]
+    seen: Set[str] = set()
+
+    def stop_when(event: str, element: Any) -> bool:
+        if event == "start" and element.tag == "meta":
+            key = element.get("property") or element.get("name")
+            content = element.get("content")
+            if key and content and content.strip():
+                seen.add(key)
+            return all(keys[0] in seen for keys in wanted)
+        if (event == "end" and element.tag == "head") or (
+            event == "start" and element.tag == "body"
+        ):
+            return all(any(key in seen for key in keys) for keys in wanted)
+        return False
+
+    return stop_when
+
 def parse_video_html(
     soup: BeautifulSoup,
     url: str,
     search_keyword: Optional[str] = None,
     playlist_name: Optional[str] = None,
     trending_category: Optional[str] = None,
+    fields: Optional[FrozenSet[str]] = None,
 ) -> Dict[str, Any]:
-    """Parse a single Rumble video page into a structured record."""
-    title = (
-        _get_meta_content(soup, "og:title")
-        or _get_first_text(soup, ["h1", ".video-title", ".video-item--title"])
-        or ""
-    )
-
-    description = (
-        _get_meta_content(soup, "og:description")
-        or _get_first_text(soup, [".video-description", ".description", "p.lead"])
-    )
+    """
+    Parse a single Rumble video page into a structured record.
 
-    channel_name = _get_first_text(
-        soup,
-        [
-            "a[href*='/c/']",
-            ".media-heading a",
-            ".channel-name",
-            "a[href*='/user/']",
-        ],
-    )
+    When `fields` is given, selector chains for other fields are skipped and
+    those fields are left as None.
+    """
+    title = None
+    if wants_field(fields, "videoTitle"):
+        title = (
+            _get_meta_content(soup, "og:title")
+            or _get_first_text(soup, ["h1", ".video-title", ".video-item--title"])
+            or ""
+        )
+
+    description = None
+    if wants_field(fields, "description"):
+        description = (
+            _get_meta_content(soup, "og:description")
+            or _get_first_text(soup, [".video-description", ".description", "p.lead"])
+        )
+
+    channel_name = None
+    if wants_field(fields, "channelName"):
+        channel_name = _get_first_text(
+            soup,
+            [
+                "a[href*='/c/']",
+                ".media-heading a",
+                ".channel-name",
+                "a[href*='/user/']",
+            ],
+        )
 
     channel_url = None
-    channel_link = soup.select_one(
-        "a[href*='/c/'], .media-heading a[href*='/'], a.channel-name"
-    )
-    if channel_link and channel_link.get("href"):
-        channel_url = urljoin(url, channel_link["href"])
+    if wants_field(fields, "channelUrl"):
+        channel_link = soup.select_one(
+            "a[href*='/c/'], .media-heading a[href*='/'], a.channel-name"
+        )
+        if channel_link and channel_link.get("href"):
+            channel_url = urljoin(url, channel_link["href"])
 
     # Views, likes, comments and revenue are rendered in various ways on Rumble;
     # we try a few common patterns and fall back gracefully.
-    views_text = _get_first_text(
-        soup, [".media-heading .views", ".rmp-view-count", "span.views"]
-    )
-    likes_text = _get_first_text(
-        soup,
-        [
-            ".rmp-like-count",
-            ".vote-up .count",
-            ".rmp-vote-up .count",
-            ".video-engagement .likes",
-        ],
-    )
-    comments_text = _get_first_text(
-        soup, [".rmp-comment-count", ".comment-count", ".video-comments-count"]
-    )
-    revenue_text = _get_first_text(
-        soup,
-        [
-            ".video-revenue",
-            ".rmp-revenue",
-            ".earnings",
-        ],
-    )
+    views_text = None
+    if wants_field(fields, "views"):
+        views_text = _get_first_text(
+            soup, [".media-heading .views", ".rmp-view-count", "span.views"]
+        )
+    likes_text = None
+    if wants_field(fields, "likes"):
+        likes_text = _get_first_text(
+            soup,
+            [
+                ".rmp-like-count",
+                ".vote-up .count",
+                ".rmp-vote-up .count",
+                ".video-engagement .likes",
+            ],
+        )
+    comments_text = None
+    if wants_field(fields, "comments"):
+        comments_text = _get_first_text(
+            soup, [".rmp-comment-count", ".comment-count", ".video-comments-count"]
+        )
+    revenue_text = None
+    if wants_field(fields, "revenue"):
+        revenue_text = _get_first_text(
+            soup,
+            [
+                ".video-revenue",
+                ".rmp-revenue",
+                ".earnings",
+            ],
+        )
 
     views = parse_number(views_text) if views_text else None
     likes = parse_number(likes_text) if likes_text else None
     comments = parse_number(comments_text) if comments_text else None
 
-    upload_date = (
-        _get_meta_content(soup, "article:published_time")
-        or _get_meta_content(soup, "og:video:release_date")
-        or _get_meta_content(soup, "date")
-    )
+    upload_date = None
+    if wants_field(fields, "uploadDate"):
+        upload_date = (
+            _get_meta_content(soup, "article:published_time")
+            or _get_meta_content(soup, "og:video:release_date")
+            or _get_meta_content(soup, "date")
+        )
 
     record: Dict[str, Any] = {
         "videoTitle": title,
@@ -112,22 +185,32 @@ def parse_video_html(
     }
     return record
 
-def extract_video(
+def fetch_video_page(
     url: str,
     config: Optional[Dict[str, Any]] = None,
-    search_keyword: Optional[str] = None,
-    playlist_name: Optional[str] = None,
-    trending_category: Optional[str] = None,
-) -> List[Dict[str, Any]]:
+    fields: Optional[FrozenSet[str]] = None,
+) -> Tuple[bytes, Optional[str]]:
     """
-    Extract a single video given its URL.
+    Download a video page, stopping after <head> when `fields` allows it.
 
-    Returns a list with exactly one record, for consistency with other extractors.
+    Returns the raw body and its declared charset, as `fetch_page` does.
     """
     cfg = config or {}
     http_cfg = cfg.get("http", {})
 
-    html = fetch_url(
+    stop_when = _head_stop_condition(fields)
+    if stop_when is not None:
+        # Only meta-backed fields were requested: stop reading after <head>.
+        return fetch_url_streaming(
+            url,
+            stop_when,
+            headers=http_cfg.get("headers"),
+            proxies=http_cfg.get("proxy"),
+            timeout=http_cfg.get("timeout", 15),
+            max_retries=http_cfg.get("max_retries", 3),
+            chunk_size=int(http_cfg.get("stream_chunk_size", 16384)),
+        )
+    return fetch_page(
         url,
         headers=http_cfg.get("headers"),
         proxies=http_cfg.get("proxy"),
@@ -135,13 +218,24 @@ def extract_video(
         max_retries=http_cfg.get("max_retries", 3),
     )
 
-    soup = BeautifulSoup(html, "lxml")
+def parse_video_page(
+    content: bytes,
+    encoding: Optional[str],
+    url: str,
+    search_keyword: Optional[str] = None,
+    playlist_name: Optional[str] = None,
+    trending_category: Optional[str] = None,
+    fields: Optional[FrozenSet[str]] = None,
+) -> List[Dict[str, Any]]:
+    """Parse a downloaded video page into a one-record list."""
+    soup = BeautifulSoup(content, "lxml", from_encoding=encoding)
     record = parse_video_html(
         soup,
         url=url,
         search_keyword=search_keyword,
         playlist_name=playlist_name,
         trending_category=trending_category,
+        fields=fields,
     )
     logger.info("Parsed video '%s' (%s)", record.get("videoTitle"), url)
     return [record]
\ No newline at end of file
@@ -1,15 +1,18 @@
 thonimport argparse
+import importlib
 import logging
 import sys
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from utils.helpers import (
+    EXPORT_FORMATS,
     configure_logging,
-    export_records,
-    flatten,
+    fetch_page,
     get_project_root,
+    iter_inputs,
     load_json,
+    normalize_fields,
 )
 
 # Ensure local `src` modules (extractors, utils) are importable when running as a script.
@@ -17,10 +20,23 @@ THIS_DIR = Path(__file__).resolve().parent
 if str(THIS_DIR) not in sys.path:
     sys.path.insert(0, str(THIS_DIR))
 
-from extractors.video_parser import extract_video
-from extractors.channel_parser import extract_channel
-from extractors.playlist_parser import extract_playlist
-from extractors.search_parser import extract_search
+# Input type -> (module, page parser). Extractor modules pull in bs4 and lxml,
+# so each is imported only when an input of that type is processed.
+EXTRACTORS: Dict[str, Tuple[str, str]] = {
+    "video": ("extractors.video_parser", "parse_video_page"),
+    "channel": ("extractors.channel_parser", "parse_channel_page"),
+    "playlist": ("extractors.playlist_parser", "parse_playlist_page"),
+    "search": ("extractors.search_parser", "parse_search_page"),
+    "trending": ("extractors.search_parser", "parse_search_page"),
+}
+
+SQLITE_SUFFIXES = (".sqlite", ".sqlite3", ".db")
+SQLITE_HEADER = b"SQLite format 3\x00"
+
+def get_parser(scrape_type: str) -> Callable[..., List[Dict[str, Any]]]:
+    """Import (on first use) and return the page parser for an input type."""
+    module_name, func_name = EXTRACTORS[scrape_type]
+    return getattr(importlib.import_module(module_name), func_name)
 
 def load_config(root: Path, config_arg: str = None) -> Dict[str, Any]:
     """
@@ -63,6 +79,216 @@ def resolve_path(root: Path, path_str: str) -> Path:
         path = root / path_str
     return path
 
+def resolve_output(
+    root: Path, output_arg: Optional[str], output_cfg: Dict[str, Any], export_format: str
+) -> Path:
+    """
+    Return the export target: `--output` if given, else `output.path`.
+
+    The configured path normally names a JSON file, so SQLite exports
+    without `--output` go to a `.sqlite` file next to it instead.
+    """
+    if output_arg:
+        return resolve_path(root, output_arg)
+    path = resolve_path(root, output_cfg.get("path", "data/sample_output.json"))
+    if export_format == "sqlite" and path.suffix.lower() not in SQLITE_SUFFIXES:
+        path = path.with_suffix(".sqlite")
+    return path
+
+def check_output(
+    output_path: Path, export_format: str, output_cfg: Dict[str, Any]
+) -> List[str]:
+    """Return problems with the export target that would only surface after scraping."""
+    problems: List[str] = []
+    if export_format == "postgres" and not output_cfg.get("dsn"):
+        problems.append("config: postgres export requires output.dsn")
+    if export_format == "sqlite" and output_path.is_file():
+        with output_path.open("rb") as f:
+            header = f.read(len(SQLITE_HEADER))
+        # An empty file is fine; SQLite initialises it on first use.
+        if header and header != SQLITE_HEADER:
+            problems.append(f"output: {output_path} exists and is not a SQLite database")
+    return problems
+
+def check_inputs(inputs: Iterable[Any], config: Dict[str, Any]) -> List[str]:
+    """
+    Validate inputs and config without importing the scraping stack.
+
+    Returns a list of human-readable problems; empty means everything is valid.
+    """
+    problems: List[str] = []
+
+    export_format = (config.get("output", {}).get("format") or "json").lower()
+    if export_format not in EXPORT_FORMATS:
+        problems.append(f"config: unsupported output format '{export_format}'")
+    try:
+        normalize_fields(config.get("scraper", {}).get("fields"))
+    except ValueError as exc:
+        problems.append(f"config: scraper.fields: {exc}")
+
+    try:
+        for position, item in enumerate(inputs):
+            problems.extend(_check_item(position, item))
+    except ValueError as exc:
+        problems.append(f"inputs: {exc}")
+
+    return problems
+
+def _check_item(position: int, item: Any) -> List[str]:
+    problems: List[str] = []
+    where = f"inputs[{position}]"
+    if not isinstance(item, dict):
+        return [f"{where}: not an object"]
+    if not item.get("url"):
+        problems.append(f"{where}: missing url")
+    scrape_type = (item.get("type") or "").lower()
+    if scrape_type not in EXTRACTORS:
+        problems.append(f"{where}: unknown type '{item.get('type')}'")
+    try:
+        normalize_fields(item.get("fields"))
+    except ValueError as exc:
+        problems.append(f"{where}: {exc}")
+    for key in ("interval", "priority"):
+        if key in item and not isinstance(item[key], (int, float)):
+            problems.append(f"{where}: {key} must be a number")
+    if isinstance(item.get("interval"), (int, float)) and item["interval"] <= 0:
+        problems.append(f"{where}: interval must be positive")
+    return problems
+
+def prepare_item(item: Any, config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Validate an input item and resolve its options into a job dict.
+
+    Returns None (after logging why) when the item should be skipped.
+    """
+    logger = logging.getLogger("main.prepare_item")
+
+    if not isinstance(item, dict):
+        logger.warning("Skipping non-object item in input: %r", item)
+        return None
+
+    url = item.get("url")
+    scrape_type = (item.get("type") or "").lower()
+
+    if not url or not scrape_type:
+        logger.warning("Skipping item missing url/type: %r", item)
+        return None
+
+    if scrape_type not in EXTRACTORS:
+        logger.warning("Unknown type '%s' in item %r; skipping.", scrape_type, item)
+        return None
+
+    return {
+        "url": url,
+        "type": scrape_type,
+        "searchKeyword": item.get("searchKeyword"),
+        "playlistName": item.get("playlistName"),
+        "trendingCategory": item.get("trendingCategory"),
+        # Per-input `fields` take precedence over the configured default.
+        "fields": normalize_fields(
+            item.get("fields") or config.get("scraper", {}).get("fields")
+        ),
+    }
+
+def fetch_item(job: Dict[str, Any], config: Dict[str, Any]) -> Tuple[bytes, Optional[str]]:
+    """Download the page for a prepared job; returns raw bytes and charset."""
+    logging.getLogger("main.fetch_item").info("Processing %s: %s", job["type"], job["url"])
+
+    if job["type"] == "video":
+        video_parser = importlib.import_module("extractors.video_parser")
+        return video_parser.fetch_video_page(
+            job["url"], config=config, fields=job["fields"]
+        )
+
+    http_cfg = config.get("http", {})
+    return fetch_page(
+        job["url"],
+        headers=http_cfg.get("headers"),
+        proxies=http_cfg.get("proxy"),
+        timeout=http_cfg.get("timeout", 15),
+        max_retries=http_cfg.get("max_retries", 3),
+    )
+
+def parse_item(
+    job: Dict[str, Any],
+    content: bytes,
+    encoding: Optional[str],
+    config: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    """Parse a downloaded page into records tagged with the job's context."""
+    parse = get_parser(job["type"])
+    scraper_cfg = config.get("scraper", {})
+    url = job["url"]
+    scrape_type = job["type"]
+    fields = job["fields"]
+    playlist_name = job["playlistName"]
+    trending_category = job["trendingCategory"]
+
+    if scrape_type == "video":
+        batch = parse(
+            content,
+            encoding,
+            url,
+            search_keyword=job["searchKeyword"],
+            playlist_name=playlist_name,
+            trending_category=trending_category,
+            fields=fields,
+        )
+    elif scrape_type == "channel":
+        max_videos = int(scraper_cfg.get("max_videos_per_channel", 50))
+        batch = parse(
+            content,
+            encoding,
+            url,
+            max_videos=max_videos,
+            fields=fields,
+        )
+    elif scrape_type == "playlist":
+        max_videos = int(scraper_cfg.get("max_videos_per_playlist", 100))
+        batch = parse(
+            content,
+            encoding,
+            url,
+            max_videos=max_videos,
+            fields=fields,
+        )
+        # Tag playlistName if provided manually
+        if playlist_name:
+            for rec in batch:
+                rec["playlistName"] = rec.get("playlistName") or playlist_name
+    else:
+        max_results = int(scraper_cfg.get("max_results_per_search", 50))
+        batch = parse(
+            content,
+            encoding,
+            url,
+            search_keyword=job["searchKeyword"],
+            max_results=max_results,
+            fields=fields,
+        )
+        if scrape_type == "trending":
+            for rec in batch:
+                rec["trendingCategory"] = (
+                    rec.get("trendingCategory") or trending_category or "Trending"
+                )
+
+    return batch
+
+def process_item(
+    item: Any, config: Dict[str, Any]
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Scrape a single input item and return its records.
+
+    Returns None when the item is skipped (malformed or of unknown type).
+    Extraction errors propagate to the caller.
+    """
+    job = prepare_item(item, config)
+    if job is None:
+        return None
+    content, encoding = fetch_item(job, config)
+    return parse_item(job, content, encoding, config)
+
 def run() -> None:
     configure_logging()
     logger = logging.getLogger("main")
@@ -88,9 +314,23 @@ def run() -> None:
     parser.add_argument(
         "--format",
         type=str,
-        choices=["json", "csv", "html"],
+        choices=list(EXPORT_FORMATS),
         help="Export format (overrides config).",
     )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help=(
+            "Keep running and re-poll each input at its interval, appending "
+            "changed records as JSON Lines (see the `watch` config section)."
+        ),
+    )
+
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Validate config and inputs, then exit without scraping.",
+    )
 
     args = parser.parse_args()
     root = get_project_root()
@@ -110,99 +350,60 @@ def run() -> None:
             "Provide one via --inputs or create data/inputs.sample.json."
         )
 
-    logger.info("Loading inputs from %s", inputs_path)
-    inputs_data = load_json(inputs_path)
-    if not isinstance(inputs_data, list):
-        raise ValueError("Input JSON must be a list of objects.")
+    # Items are streamed from disk, so scraping starts before the file is read.
+    logger.info("Reading inputs from %s", inputs_path)
+    inputs_data = iter_inputs(inputs_path)
 
     # Resolve output
-    if args.output:
-        output_path = resolve_path(root, args.output)
-    else:
+    export_format = (args.format or output_cfg.get("format") or "json").lower()
+    output_path = resolve_output(root, args.output, output_cfg, export_format)
+
+    if args.check:
+        problems = check_inputs(inputs_data, config)
+        if not args.watch:
+            problems.extend(check_output(output_path, export_format, output_cfg))
+        for problem in problems:
+            logger.error("%s", problem)
+        if problems:
+            raise SystemExit(1)
+        logger.info("Config and inputs look valid.")
+        return
+
+    if args.watch:
+        from utils.watcher import watch
+
+        watch_cfg = config.get("watch", {})
         output_path = resolve_path(
-            root, output_cfg.get("path", "data/sample_output.json")
+            root, args.output or watch_cfg.get("output", "data/watch_output.jsonl")
         )
+        # The scheduler revisits every input, so it needs them all in memory.
+        watch(list(inputs_data), config, process_item, output_path)
+        return
 
-    export_format = (args.format or output_cfg.get("format") or "json").lower()
+    problems = check_output(output_path, export_format, output_cfg)
+    if problems:
+        raise ValueError("; ".join(problems))
 
-    all_batches: List[List[Dict[str, Any]]] = []
-
-    for item in inputs_data:
-        if not isinstance(item, dict):
-            logger.warning("Skipping non-object item in input: %r", item)
-            continue
-
-        url = item.get("url")
-        scrape_type = (item.get("type") or "").lower()
-        search_keyword = item.get("searchKeyword")
-        playlist_name = item.get("playlistName")
-        trending_category = item.get("trendingCategory")
-
-        if not url or not scrape_type:
-            logger.warning("Skipping item missing url/type: %r", item)
-            continue
-
-        logger.info("Processing %s: %s", scrape_type, url)
-
-        try:
-            if scrape_type == "video":
-                batch = extract_video(
-                    url=url,
-                    config=config,
-                    search_keyword=search_keyword,
-                    playlist_name=playlist_name,
-                    trending_category=trending_category,
-                )
-            elif scrape_type == "channel":
-                max_videos = int(
-                    config.get("scraper", {}).get("max_videos_per_channel", 50)
-                )
-                batch = extract_channel(
-                    url=url,
-                    config=config,
-                    max_videos=max_videos,
-                )
-            elif scrape_type == "playlist":
-                max_videos = int(
-                    config.get("scraper", {}).get("max_videos_per_playlist", 100)
-                )
-                batch = extract_playlist(
-                    url=url,
-                    config=config,
-                    max_videos=max_videos,
-                )
-                # Tag playlistName if provided manually
-                if playlist_name:
-                    for rec in batch:
-                        rec["playlistName"] = rec.get("playlistName") or playlist_name
-            elif scrape_type in ("search", "trending"):
-                max_results = int(
-                    config.get("scraper", {}).get("max_results_per_search", 50)
-                )
-                batch = extract_search(
-                    url=url,
-                    config=config,
-                    search_keyword=search_keyword,
-                    max_results=max_results,
-                )
-                if scrape_type == "trending":
-                    for rec in batch:
-                        rec["trendingCategory"] = (
-                            rec.get("trendingCategory") or trending_category or "Trending"
-                        )
-            else:
-                logger.warning("Unknown type '%s' in item %r; skipping.", scrape_type, item)
-                continue
-
-            all_batches.append(batch)
-        except Exception as exc:  # noqa: BLE001
-            logger.exception("Failed to process %s (%s): %s", scrape_type, url, exc)
-
-    all_records = flatten(all_batches)
-    logger.info("Collected %s total records.", len(all_records))
-
-    export_records(all_records, output_path=output_path, export_format=export_format)
-    logger.info("Done. Output written to %s", output_path)
+    from utils.pipeline import RecordSink, run_pipeline
+
+    # Fetch, parse and export run as concurrent stages with bounded queues
+    # between them (see the `pipeline` config section).
+    sink = RecordSink(output_path, export_format=export_format, options=output_cfg)
+    run_pipeline(
+        inputs_data,
+        prepare=lambda item: prepare_item(item, config),
+        fetch=lambda job: fetch_item(job, config),
+        parse=lambda job, content, encoding: parse_item(job, content, encoding, config),
+        sink=sink,
+        pipeline_cfg=config.get("pipeline", {}),
+    )
+    logger.info("Collected %s total records.", sink.count)
+    if export_format == "postgres":
+        from utils.db_export import describe_dsn
+
+        logger.info("Done. Output written to PostgreSQL at %s", describe_dsn(output_cfg["dsn"]))
+    else:
+        logger.info("Done. Output written to %s", output_path)
 
 if __name__ == "__main__":
     run()
\ No newline at end of file
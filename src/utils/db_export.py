@@ -0,0 +1,151 @@
+import logging
+import re
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+from utils.helpers import RECORD_FIELDS, ensure_path
+
+logger = logging.getLogger("db_export")
+
+# Engagement counters that change over time; every export appends a snapshot.
+STAT_FIELDS = ("views", "likes", "comments")
+
+_INTEGER_FIELDS = frozenset(STAT_FIELDS)
+
+def _schema(integer_type: str) -> List[str]:
+    columns = ",\n    ".join(
+        f'"{name}" {integer_type if name in _INTEGER_FIELDS else "TEXT"}'
+        + (" PRIMARY KEY" if name == "videoUrl" else "")
+        for name in RECORD_FIELDS
+    )
+    stats = ",\n    ".join(f'"{name}" {integer_type}' for name in STAT_FIELDS)
+    return [
+        f'CREATE TABLE IF NOT EXISTS videos (\n    {columns},\n    "updatedAt" TEXT\n)',
+        "CREATE TABLE IF NOT EXISTS video_stats (\n"
+        '    "videoUrl" TEXT NOT NULL,\n'
+        '    "capturedAt" TEXT NOT NULL,\n'
+        f"    {stats}\n)",
+        "CREATE INDEX IF NOT EXISTS video_stats_url_time "
+        'ON video_stats ("videoUrl", "capturedAt")',
+    ]
+
+def _upsert_sql(placeholder: str) -> str:
+    columns = list(RECORD_FIELDS) + ["updatedAt"]
+    names = ", ".join(f'"{name}"' for name in columns)
+    values = ", ".join(placeholder for _ in columns)
+    # Keep known values when a later, sparser source (e.g. a listing page
+    # without likes) reports the same video.
+    updates = ", ".join(
+        f'"{name}" = COALESCE(excluded."{name}", videos."{name}")'
+        for name in columns
+        if name != "videoUrl"
+    )
+    return (
+        f"INSERT INTO videos ({names}) VALUES ({values}) "
+        f'ON CONFLICT ("videoUrl") DO UPDATE SET {updates}'
+    )
+
+def _history_sql(placeholder: str) -> str:
+    columns = ["videoUrl", "capturedAt"] + list(STAT_FIELDS)
+    names = ", ".join(f'"{name}"' for name in columns)
+    values = ", ".join(placeholder for _ in columns)
+    return f"INSERT INTO video_stats ({names}) VALUES ({values})"
+
+def _batches(
+    records: Sequence[Dict[str, Any]], batch_size: int
+) -> Iterator[Sequence[Dict[str, Any]]]:
+    for start in range(0, len(records), batch_size):
+        yield records[start : start + batch_size]
+
+def _write(
+    conn: Any,
+    records: Sequence[Dict[str, Any]],
+    placeholder: str,
+    batch_size: int,
+) -> int:
+    """Upsert `records` in one transaction per batch; return rows written."""
+    captured_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    upsert_sql = _upsert_sql(placeholder)
+    history_sql = _history_sql(placeholder)
+
+    written = 0
+    for batch in _batches([r for r in records if r.get("videoUrl")], batch_size):
+        rows = [
+            tuple(record.get(name) for name in RECORD_FIELDS) + (captured_at,)
+            for record in batch
+        ]
+        history = [
+            (record["videoUrl"], captured_at)
+            + tuple(record.get(name) for name in STAT_FIELDS)
+            for record in batch
+            if any(record.get(name) is not None for name in STAT_FIELDS)
+        ]
+        cursor = conn.cursor()
+        try:
+            cursor.executemany(upsert_sql, rows)
+            if history:
+                cursor.executemany(history_sql, history)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+        written += len(rows)
+    return written
+
+def export_to_sqlite(
+    records: Sequence[Dict[str, Any]], output_path: Path, batch_size: int = 500
+) -> None:
+    """Upsert records into the `videos` table of a SQLite database file."""
+    conn = sqlite3.connect(str(ensure_path(output_path)))
+    try:
+        for statement in _schema("INTEGER"):
+            conn.execute(statement)
+        conn.commit()
+        written = _write(conn, records, "?", batch_size)
+    finally:
+        conn.close()
+    logger.info("Upserted %s records into SQLite at %s", written, output_path)
+
+def describe_dsn(dsn: str) -> str:
+    """Return `dsn` with its password masked, for logging."""
+    if "://" in dsn:
+        parts = urlsplit(dsn)
+        if parts.password is None:
+            return dsn
+        netloc = parts.netloc.replace(f":{parts.password}@", ":***@", 1)
+        return parts._replace(netloc=netloc).geturl()
+    return re.sub(r"(password\s*=\s*)('(?:[^'\\]|\\.)*'|\S+)", r"\1***", dsn)
+
+def _connect_postgres(dsn: str) -> Any:
+    try:
+        import psycopg
+    except ImportError:
+        try:
+            import psycopg2 as psycopg
+        except ImportError:
+            raise RuntimeError(
+                "PostgreSQL export requires `psycopg` (or `psycopg2`) to be installed."
+            ) from None
+    return psycopg.connect(dsn)
+
+def export_to_postgres(
+    records: Sequence[Dict[str, Any]], dsn: Optional[str], batch_size: int = 500
+) -> None:
+    """Upsert records into the `videos` table of a PostgreSQL database."""
+    if not dsn:
+        raise ValueError("PostgreSQL export requires `output.dsn` in the config.")
+
+    conn = _connect_postgres(dsn)
+    try:
+        for statement in _schema("BIGINT"):
+            conn.cursor().execute(statement)
+        conn.commit()
+        written = _write(conn, records, "%s", batch_size)
+    finally:
+        conn.close()
+    logger.info("Upserted %s records into PostgreSQL at %s", written, describe_dsn(dsn))
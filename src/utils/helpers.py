@@ -1,11 +1,52 @@
-thonimport csv
+thonimport codecs
+import csv
+import itertools
 import json
 import logging
+import mmap
+import os
+import re
+import stat
+import threading
 import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+)
 
-import requests
+if TYPE_CHECKING:
+    import requests
+
+# Output schema shared by every extractor, in export order.
+RECORD_FIELDS = (
+    "videoTitle",
+    "videoUrl",
+    "channelName",
+    "channelUrl",
+    "views",
+    "likes",
+    "comments",
+    "revenue",
+    "uploadDate",
+    "description",
+    "playlistName",
+    "searchKeyword",
+    "trendingCategory",
+)
+
+# Formats accepted by `export_records`.
+EXPORT_FORMATS = ("json", "jsonl", "csv", "html", "sqlite", "postgres")
 
 def configure_logging(level: int = logging.INFO) -> None:
     """Configure root logger once."""
@@ -26,40 +67,107 @@ def get_project_root() -> Path:
     """
     return Path(__file__).resolve().parents[2]
 
-def fetch_url(
-    url: str,
-    headers: Optional[Dict[str, str]] = None,
-    proxies: Optional[Dict[str, str]] = None,
-    timeout: int = 15,
-    max_retries: int = 3,
-    backoff_factor: float = 1.5,
-) -> str:
-    """Fetch a URL with basic retry logic and logging."""
-    logger = logging.getLogger("helpers.fetch_url")
+@lru_cache(maxsize=None)
+def _accept_encoding() -> str:
+    """
+    Content codings this environment can decode, best first.
+
+    urllib3 advertises `br` and `zstd` only when the optional `brotli` /
+    `zstandard` packages are importable, so we never ask for a body we
+    cannot decompress.
+    """
+    try:
+        from urllib3.util.request import ACCEPT_ENCODING
+    except ImportError:
+        return "gzip, deflate"
+    codings = [c.strip() for c in ACCEPT_ENCODING.split(",") if c.strip()]
+    preferred = ["br", "zstd", "gzip", "deflate"]
+    codings.sort(key=lambda c: preferred.index(c) if c in preferred else len(preferred))
+    return ", ".join(codings)
+
+# `requests` is imported on first fetch, so --check runs and other commands
+# that never touch the network start without it.
+_SESSIONS = threading.local()
+
+def get_session() -> "requests.Session":
+    """
+    Return this thread's HTTP session.
+
+    Reusing a session keeps connections to Rumble pooled across pages,
+    which matters most for long-running watch mode. `requests.Session` is
+    not thread-safe, so each pipeline fetch worker gets its own.
+    """
+    session = getattr(_SESSIONS, "session", None)
+    if session is None:
+        import requests
+
+        session = _SESSIONS.session = requests.Session()
+    return session
 
-    session = requests.Session()
+def _build_headers(headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
     final_headers = {
         "User-Agent": (
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
             "AppleWebKit/537.36 (KHTML, like Gecko) "
             "Chrome/120.0 Safari/537.36"
-        )
+        ),
+        "Accept-Encoding": _accept_encoding(),
     }
     if headers:
         final_headers.update(headers)
+    return final_headers
+
+def declared_charset(content_type: Optional[str]) -> Optional[str]:
+    """
+    Return the charset declared in a Content-Type header, if it is a known codec.
+
+    Unlike `requests`, this does not default `text/*` to ISO-8859-1, so the
+    HTML parser falls back to the document's own `<meta charset>` instead.
+    """
+    if not content_type:
+        return None
+    from email.message import Message
+
+    message = Message()
+    message["content-type"] = content_type
+    charset = message.get_content_charset()
+    if not charset:
+        return None
+    try:
+        codecs.lookup(charset)
+    except LookupError:
+        return None
+    return charset
+
+def _fetch_with_retries(
+    url: str,
+    read: Callable[["requests.Response"], Any],
+    logger: logging.Logger,
+    headers: Optional[Dict[str, str]] = None,
+    proxies: Optional[Dict[str, str]] = None,
+    timeout: int = 15,
+    max_retries: int = 3,
+    backoff_factor: float = 1.5,
+    stream: bool = False,
+) -> Any:
+    """Issue a GET with retries and return `read(response)` for the first success."""
+    import requests
+
+    session = get_session()
+    final_headers = _build_headers(headers)
 
     for attempt in range(1, max_retries + 1):
         try:
             logger.debug("Requesting %s (attempt %s)", url, attempt)
-            response = session.get(
+            with session.get(
                 url,
                 headers=final_headers,
                 proxies=proxies,
                 timeout=timeout,
-            )
-            response.raise_for_status()
-            logger.info("Fetched %s (%s)", url, response.status_code)
-            return response.text
+                stream=stream,
+            ) as response:
+                response.raise_for_status()
+                return read(response)
         except requests.RequestException as exc:
             logger.warning(
                 "Attempt %s/%s failed for %s: %s",
@@ -75,7 +183,109 @@ def fetch_url(
             time.sleep(sleep_for)
 
     # Should never reach here
-    raise RuntimeError("Unexpected fetch_url failure")
+    raise RuntimeError("Unexpected fetch failure")
+
+def fetch_page(
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    proxies: Optional[Dict[str, str]] = None,
+    timeout: int = 15,
+    max_retries: int = 3,
+    backoff_factor: float = 1.5,
+) -> Tuple[bytes, Optional[str]]:
+    """
+    Fetch a URL and return the raw (decompressed) body plus its declared charset.
+
+    Pass both straight to `BeautifulSoup(content, "lxml", from_encoding=...)`
+    so the page is decoded once by the parser instead of going through
+    `response.text` first.
+    """
+    logger = logging.getLogger("helpers.fetch_page")
+
+    def read(response: "requests.Response") -> Tuple[bytes, Optional[str]]:
+        content = response.content
+        logger.info(
+            "Fetched %s (%s, %s bytes, %s)",
+            url,
+            response.status_code,
+            len(content),
+            response.headers.get("Content-Encoding", "identity"),
+        )
+        return content, declared_charset(response.headers.get("Content-Type"))
+
+    return _fetch_with_retries(
+        url,
+        read,
+        logger,
+        headers=headers,
+        proxies=proxies,
+        timeout=timeout,
+        max_retries=max_retries,
+        backoff_factor=backoff_factor,
+    )
+
+def fetch_url_streaming(
+    url: str,
+    stop_when: Callable[[str, Any], bool],
+    headers: Optional[Dict[str, str]] = None,
+    proxies: Optional[Dict[str, str]] = None,
+    timeout: int = 15,
+    max_retries: int = 3,
+    backoff_factor: float = 1.5,
+    chunk_size: int = 16384,
+) -> Tuple[bytes, Optional[str]]:
+    """
+    Fetch a URL in chunks, stopping as soon as `stop_when` says enough was read.
+
+    Each chunk is fed to an incremental lxml parser and `stop_when(event, element)`
+    is called for every ``start``/``end`` event. Once it returns True the
+    transfer is aborted. Returns the bytes read so far and the declared
+    charset, like `fetch_page`; lxml recovers the truncated document fine
+    when it is parsed again afterwards.
+    """
+    from lxml import etree
+
+    logger = logging.getLogger("helpers.fetch_url_streaming")
+
+    def read(response: "requests.Response") -> Tuple[bytes, Optional[str]]:
+        parser = etree.HTMLPullParser(events=("start", "end"))
+        chunks: List[bytes] = []
+        stopped = False
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if not chunk:
+                continue
+            chunks.append(chunk)
+            parser.feed(chunk)
+            for event, element in parser.read_events():
+                if stop_when(event, element):
+                    stopped = True
+                    break
+            if stopped:
+                break
+
+        body = b"".join(chunks)
+        if stopped:
+            logger.info(
+                "Fetched %s (%s), stopped early after %s bytes",
+                url,
+                response.status_code,
+                len(body),
+            )
+        else:
+            logger.info("Fetched %s (%s)", url, response.status_code)
+        return body, declared_charset(response.headers.get("Content-Type"))
+
+    return _fetch_with_retries(
+        url,
+        read,
+        logger,
+        headers=headers,
+        proxies=proxies,
+        timeout=timeout,
+        max_retries=max_retries,
+        backoff_factor=backoff_factor,
+        stream=True,
+    )
 
 def parse_number(text: Optional[str]) -> Optional[int]:
     """
@@ -123,6 +333,29 @@ def parse_number(text: Optional[str]) -> Optional[int]:
     except ValueError:
         return None
 
+def normalize_fields(fields: Any) -> Optional[FrozenSet[str]]:
+    """
+    Normalize a `fields` option into a set of output field names.
+
+    Accepts a list of names or a comma separated string. Returns None when
+    no restriction applies, i.e. every field should be extracted.
+    """
+    if not fields:
+        return None
+
+    if isinstance(fields, str):
+        fields = fields.split(",")
+
+    wanted = frozenset(str(name).strip() for name in fields if str(name).strip())
+    unknown = wanted.difference(RECORD_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown output field(s): {', '.join(sorted(unknown))}")
+    return wanted or None
+
+def wants_field(fields: Optional[FrozenSet[str]], name: str) -> bool:
+    """Return True if `name` should be extracted given a normalized `fields` set."""
+    return fields is None or name in fields
+
 def ensure_path(path: Path) -> Path:
     """Ensure parent folder exists for given file path."""
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -132,27 +365,58 @@ def export_records(
     records: List[Dict[str, Any]],
     output_path: Path,
     export_format: str = "json",
+    options: Optional[Dict[str, Any]] = None,
 ) -> None:
     """
-    Export scraped records to JSON, CSV, or HTML.
+    Export scraped records to JSON, JSON Lines, CSV, HTML, SQLite or PostgreSQL.
+
+    `options` is the `output` config section; the database formats read
+    `batch_size` and (for PostgreSQL) `dsn` from it.
     """
     logger = logging.getLogger("helpers.export_records")
     export_format = export_format.lower()
-    output_path = ensure_path(output_path)
+    if export_format not in ("sqlite", "postgres"):
+        # The database exporters manage their own target.
+        output_path = ensure_path(output_path)
 
     if export_format == "json":
         with output_path.open("w", encoding="utf-8") as f:
             json.dump(records, f, indent=2, ensure_ascii=False)
         logger.info("Exported %s records to JSON at %s", len(records), output_path)
+    elif export_format == "jsonl":
+        with output_path.open("w", encoding="utf-8") as f:
+            write_jsonl(records, f)
+        logger.info("Exported %s records to JSON Lines at %s", len(records), output_path)
     elif export_format == "csv":
         export_to_csv(records, output_path)
         logger.info("Exported %s records to CSV at %s", len(records), output_path)
     elif export_format == "html":
         export_to_html(records, output_path)
         logger.info("Exported %s records to HTML at %s", len(records), output_path)
+    elif export_format in ("sqlite", "postgres"):
+        from utils.db_export import export_to_postgres, export_to_sqlite
+
+        opts = options or {}
+        batch_size = int(opts.get("batch_size", 500))
+        if export_format == "sqlite":
+            export_to_sqlite(records, output_path, batch_size=batch_size)
+        else:
+            export_to_postgres(records, opts.get("dsn"), batch_size=batch_size)
     else:
         raise ValueError(f"Unsupported export format: {export_format}")
 
+def write_jsonl(records: Iterable[Dict[str, Any]], f: TextIO) -> None:
+    """Write records to an open text file, one JSON object per line."""
+    for record in records:
+        f.write(json.dumps(record, ensure_ascii=False))
+        f.write("\n")
+
+def append_jsonl(records: List[Dict[str, Any]], output_path: Path) -> None:
+    """Append records to a JSON Lines file, creating it if needed."""
+    output_path = ensure_path(output_path)
+    with output_path.open("a", encoding="utf-8") as f:
+        write_jsonl(records, f)
+
 def export_to_csv(records: List[Dict[str, Any]], output_path: Path) -> None:
     if not records:
         output_path.write_text("", encoding="utf-8")
@@ -215,9 +479,143 @@ def load_json(path: Path) -> Any:
     with path.open("r", encoding="utf-8") as f:
         return json.load(f)
 
-def flatten(list_of_lists: Iterable[Iterable[Any]]) -> List[Any]:
-    """Flatten a list of iterables into a simple list."""
-    flattened: List[Any] = []
-    for it in list_of_lists:
-        flattened.extend(list(it))
-    return flattened
\ No newline at end of file
+_NON_WHITESPACE = re.compile(rb"\S")
+_WHITESPACE = re.compile(r"\s*")
+
+def iter_inputs(path: Path, chunk_size: int = 1 << 20) -> Iterator[Any]:
+    """
+    Yield input items one at a time, without loading the whole file.
+
+    `.jsonl` / `.ndjson` files (or any non-`.json` file that does not start
+    with `[`) are read as JSON Lines. Otherwise the file must hold a JSON
+    array, which is parsed element by element, so memory use depends on the
+    largest item rather than on the file size. Regular files are read
+    through a memory map; pipes such as `--inputs /dev/stdin` are read as
+    they arrive.
+    """
+    with path.open("rb") as f:
+        st = os.fstat(f.fileno())
+        if not stat.S_ISREG(st.st_mode):
+            yield from _iter_input_chunks(
+                path, iter(lambda: f.read1(chunk_size), b"")
+            )
+            return
+        if st.st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from _iter_input_chunks(
+                path,
+                (mm[pos : pos + chunk_size] for pos in range(0, len(mm), chunk_size)),
+            )
+
+def _iter_input_chunks(path: Path, chunks: Iterator[bytes]) -> Iterator[Any]:
+    # Read up to the first significant byte to tell JSON Lines from an array.
+    head = b""
+    first = None
+    for chunk in chunks:
+        head += chunk
+        if len(head) < len(codecs.BOM_UTF8) and codecs.BOM_UTF8.startswith(head):
+            continue
+        start = len(codecs.BOM_UTF8) if head.startswith(codecs.BOM_UTF8) else 0
+        first = _NON_WHITESPACE.search(head, start)
+        if first is not None:
+            break
+    if first is None:
+        return
+
+    is_array = head[first.start() : first.start() + 1] == b"["
+    suffix = path.suffix.lower()
+    if suffix in (".jsonl", ".ndjson") or (not is_array and suffix != ".json"):
+        yield from _iter_json_lines(itertools.chain([head[start:]], chunks))
+    elif is_array:
+        yield from _iter_json_array(
+            itertools.chain([head[first.start() + 1 :]], chunks)
+        )
+    else:
+        raise ValueError("Input JSON must be a list of objects.")
+
+def _iter_json_lines(chunks: Iterable[bytes]) -> Iterator[Any]:
+    line_no = 0
+    pending = b""
+    # The trailing newline flushes a last line that has none.
+    for chunk in itertools.chain(chunks, [b"\n"]):
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            line_no += 1
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as exc:
+                raise ValueError(
+                    f"Invalid JSON on input line {line_no}: {exc}"
+                ) from None
+
+def _iter_json_array(chunks: Iterator[bytes]) -> Iterator[Any]:
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    idx = 0
+    eof = False
+
+    def fill() -> None:
+        # Drop consumed text and decode the next chunk of the file.
+        nonlocal buf, idx, eof
+        chunk = next(chunks, None)
+        eof = chunk is None
+        buf = buf[idx:] + utf8.decode(chunk or b"", final=eof)
+        idx = 0
+
+    def next_char() -> str:
+        nonlocal idx
+        while True:
+            idx = _WHITESPACE.match(buf, idx).end()
+            if idx < len(buf):
+                return buf[idx]
+            if eof:
+                raise ValueError("Input JSON array is not terminated.")
+            fill()
+
+    def finish() -> None:
+        # Like json.load, allow nothing but whitespace after the array.
+        nonlocal idx
+        while True:
+            idx = _WHITESPACE.match(buf, idx).end()
+            if idx < len(buf):
+                raise ValueError("Extra data after the input JSON array.")
+            if eof:
+                return
+            fill()
+
+    if next_char() == "]":
+        idx += 1
+        finish()
+        return
+
+    while True:
+        next_char()
+        while True:
+            try:
+                item, end = decoder.raw_decode(buf, idx)
+            except json.JSONDecodeError as exc:
+                if eof:
+                    raise ValueError(f"Invalid JSON in input array: {exc}") from None
+                fill()
+                continue
+            # A value at the end of the buffer may be cut short (e.g. `12` of
+            # `12.5`), so only trust it once a delimiter follows.
+            if eof or (end < len(buf) and (buf[end] in ",]" or buf[end].isspace())):
+                break
+            fill()
+        yield item
+        idx = end
+
+        delimiter = next_char()
+        idx += 1
+        if delimiter == "]":
+            finish()
+            return
+        if delimiter != ",":
+            raise ValueError(f"Expected ',' or ']' in input array, got {delimiter!r}")
\ No newline at end of file
@@ -0,0 +1,350 @@
+import json
+import logging
+import os
+import textwrap
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from utils.helpers import ensure_path, export_records, write_jsonl
+
+logger = logging.getLogger("pipeline")
+
+# Returned by `BoundedQueue.get` once the queue is closed and drained.
+DONE = object()
+
+class BoundedQueue:
+    """
+    Thread-safe FIFO capped by item count and by total item cost.
+
+    Cost is whatever the stage cares about: bytes of HTML for fetched pages,
+    number of records for parsed batches. `put` blocks while a cap would be
+    exceeded, so a slow consumer throttles its producers instead of letting
+    memory grow. An item bigger than the whole cost cap is still admitted
+    once the queue is empty, so one oversized page cannot stall the run.
+    """
+
+    def __init__(
+        self, name: str, max_cost: int, max_items: Optional[int] = None
+    ) -> None:
+        self.name = name
+        self.max_cost = max_cost
+        self.max_items = max_items
+        self._items: Deque[Tuple[Any, int]] = deque()
+        self._cost = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        # Metrics, read through `stats()`.
+        self._puts = 0
+        self._peak_items = 0
+        self._peak_cost = 0
+        self._blocked_puts = 0
+        self._blocked_seconds = 0.0
+
+    def _full(self, cost: int) -> bool:
+        if not self._items:
+            return False
+        if self.max_items is not None and len(self._items) >= self.max_items:
+            return True
+        return self._cost + cost > self.max_cost
+
+    def put(self, item: Any, cost: int = 1) -> bool:
+        """Enqueue `item`, blocking while full. Returns False if the queue was aborted."""
+        with self._cond:
+            blocked_since: Optional[float] = None
+            while not self._closed and self._full(cost):
+                if blocked_since is None:
+                    blocked_since = time.monotonic()
+                    self._blocked_puts += 1
+                self._cond.wait()
+            if blocked_since is not None:
+                self._blocked_seconds += time.monotonic() - blocked_since
+            if self._closed:
+                return False
+
+            self._items.append((item, cost))
+            self._cost += cost
+            self._puts += 1
+            self._peak_items = max(self._peak_items, len(self._items))
+            self._peak_cost = max(self._peak_cost, self._cost)
+            self._cond.notify_all()
+            return True
+
+    def get(self) -> Any:
+        """Dequeue the next item, blocking while empty. Returns `DONE` once closed and drained."""
+        with self._cond:
+            while not self._items and not self._closed:
+                self._cond.wait()
+            if not self._items:
+                return DONE
+            item, cost = self._items.popleft()
+            self._cost -= cost
+            self._cond.notify_all()
+            return item
+
+    def close(self) -> None:
+        """Signal that no more items will be put; consumers drain what is left."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def abort(self) -> None:
+        """Close the queue and drop pending items, releasing blocked producers."""
+        with self._cond:
+            self._closed = True
+            self._items.clear()
+            self._cost = 0
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "depth": len(self._items),
+                "cost": self._cost,
+                "peak_depth": self._peak_items,
+                "peak_cost": self._peak_cost,
+                "puts": self._puts,
+                "blocked_puts": self._blocked_puts,
+                "blocked_seconds": round(self._blocked_seconds, 3),
+            }
+
+class RecordSink:
+    """
+    Writes record batches to the configured output as they arrive.
+
+    JSON, JSON Lines and the database formats are written incrementally, so
+    records do not pile up in memory. CSV and HTML build their header from
+    every record and are exported in one go when the sink is closed.
+
+    JSON and JSON Lines go to a temporary file next to `output_path` that
+    replaces it on `close()`; `abort()` discards it, so a failed run leaves
+    any previous output untouched. Database batches already flushed stay
+    committed.
+    """
+
+    def __init__(
+        self,
+        output_path: Path,
+        export_format: str = "json",
+        options: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.output_path = output_path
+        self.export_format = export_format.lower()
+        self.options = options or {}
+        self.count = 0
+        self._buffer: List[Dict[str, Any]] = []
+        self._file = None
+        self._tmp_path: Optional[Path] = None
+        if self.export_format in ("json", "jsonl"):
+            target = ensure_path(output_path)
+            self._tmp_path = target.with_name(f".{target.name}.tmp")
+            self._file = self._tmp_path.open("w", encoding="utf-8")
+
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        if self.export_format == "json":
+            # Same layout as json.dump(records, f, indent=2), one record at a time.
+            for record in records:
+                self._file.write("[\n" if self.count == 0 else ",\n")
+                self._file.write(
+                    textwrap.indent(
+                        json.dumps(record, indent=2, ensure_ascii=False), "  "
+                    )
+                )
+                self.count += 1
+        elif self.export_format == "jsonl":
+            write_jsonl(records, self._file)
+            self.count += len(records)
+        else:
+            self._buffer.extend(records)
+            self.count += len(records)
+            if self.export_format in ("sqlite", "postgres"):
+                if len(self._buffer) >= int(self.options.get("batch_size", 500)):
+                    self._flush()
+
+    def _flush(self) -> None:
+        if self._buffer:
+            export_records(
+                self._buffer, self.output_path, self.export_format, self.options
+            )
+            self._buffer = []
+
+    def close(self) -> None:
+        if self._file is not None:
+            if self.export_format == "json":
+                self._file.write("\n]" if self.count else "[]")
+            self._file.close()
+            self._file = None
+            os.replace(self._tmp_path, self.output_path)
+            self._tmp_path = None
+            logger.info(
+                "Exported %s records to %s at %s",
+                self.count,
+                self.export_format.upper(),
+                self.output_path,
+            )
+        elif self.export_format in ("sqlite", "postgres"):
+            self._flush()
+        else:
+            export_records(
+                self._buffer, self.output_path, self.export_format, self.options
+            )
+            self._buffer = []
+
+    def abort(self) -> None:
+        """Drop unwritten records and the temporary file, keeping the old output."""
+        self._buffer = []
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._tmp_path is not None:
+            try:
+                self._tmp_path.unlink()
+            except FileNotFoundError:
+                pass
+            self._tmp_path = None
+
+def run_pipeline(
+    items: Iterable[Any],
+    prepare: Callable[[Any], Optional[Any]],
+    fetch: Callable[[Any], Tuple[bytes, Optional[str]]],
+    parse: Callable[[Any, bytes, Optional[str]], List[Dict[str, Any]]],
+    sink: RecordSink,
+    pipeline_cfg: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run fetch, parse and export as concurrent stages joined by bounded queues.
+
+    `prepare` turns an input item into a job (or None to skip it), `fetch`
+    downloads a job's page and `parse` turns the page into records, which
+    are handed to `sink` on the calling thread. Raw pages are capped by
+    `max_pending_bytes` / `max_pending_pages` and parsed records by
+    `max_pending_records`, so the slowest stage sets the pace for the
+    others. Returns final queue metrics; they are also logged every
+    `metrics_interval` seconds.
+
+    With more than one fetch or parse worker, records may be exported in a
+    different order than the inputs.
+    """
+    cfg = pipeline_cfg or {}
+    fetch_workers = max(1, int(cfg.get("fetch_workers", 1)))
+    parse_workers = max(1, int(cfg.get("parse_workers", 1)))
+    metrics_interval = float(cfg.get("metrics_interval", 30))
+
+    pages = BoundedQueue(
+        "pages",
+        max_cost=int(cfg.get("max_pending_bytes", 64 * 1024 * 1024)),
+        max_items=int(cfg.get("max_pending_pages", 64)),
+    )
+    records = BoundedQueue(
+        "records", max_cost=int(cfg.get("max_pending_records", 10000))
+    )
+    queues = (pages, records)
+
+    source = iter(items)
+    source_lock = threading.Lock()
+    stage_lock = threading.Lock()
+    errors: List[BaseException] = []
+    finished = threading.Event()
+
+    def abort() -> None:
+        for queue in queues:
+            queue.abort()
+
+    def stage_done(counter: List[int], downstream: BoundedQueue) -> None:
+        # The last worker of a stage closes the queue it feeds.
+        with stage_lock:
+            counter[0] -= 1
+            last = counter[0] == 0
+        if last:
+            downstream.close()
+
+    fetchers_left = [fetch_workers]
+    parsers_left = [parse_workers]
+
+    def fetch_worker() -> None:
+        try:
+            while True:
+                with source_lock:
+                    try:
+                        item = next(source)
+                    except StopIteration:
+                        return
+                    except Exception as exc:  # noqa: BLE001
+                        # A broken inputs file ends the run without output.
+                        errors.append(exc)
+                        abort()
+                        return
+                try:
+                    job = prepare(item)
+                    if job is None:
+                        continue
+                    content, encoding = fetch(job)
+                except Exception as exc:  # noqa: BLE001
+                    logger.exception("Failed to fetch %r: %s", item, exc)
+                    continue
+                if not pages.put((job, content, encoding), cost=len(content)):
+                    return
+        finally:
+            stage_done(fetchers_left, pages)
+
+    def parse_worker() -> None:
+        try:
+            while True:
+                page = pages.get()
+                if page is DONE:
+                    return
+                job, content, encoding = page
+                del page
+                try:
+                    batch = parse(job, content, encoding)
+                except Exception as exc:  # noqa: BLE001
+                    logger.exception("Failed to parse %r: %s", job, exc)
+                    continue
+                if batch and not records.put(batch, cost=len(batch)):
+                    return
+        finally:
+            stage_done(parsers_left, records)
+
+    def report() -> None:
+        while not finished.wait(metrics_interval):
+            for queue in queues:
+                logger.info("Queue %s: %s", queue.name, queue.stats())
+
+    threads = [
+        threading.Thread(target=fetch_worker, name=f"fetch-{n}", daemon=True)
+        for n in range(fetch_workers)
+    ] + [
+        threading.Thread(target=parse_worker, name=f"parse-{n}", daemon=True)
+        for n in range(parse_workers)
+    ]
+    if metrics_interval > 0:
+        threads.append(threading.Thread(target=report, name="metrics", daemon=True))
+    for thread in threads:
+        thread.start()
+
+    try:
+        while True:
+            batch = records.get()
+            if batch is DONE:
+                break
+            sink.write(batch)
+        finished.set()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+        sink.close()
+    except BaseException:
+        abort()
+        sink.abort()
+        raise
+    finally:
+        finished.set()
+
+    stats = {queue.name: queue.stats() for queue in queues}
+    for name, queue_stats in stats.items():
+        logger.info("Queue %s final: %s", name, queue_stats)
+    return stats
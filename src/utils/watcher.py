@@ -0,0 +1,182 @@
+import hashlib
+import heapq
+import json
+import logging
+import math
+import random
+import signal
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.helpers import append_jsonl
+
+logger = logging.getLogger("watcher")
+
+# Seconds between polls per input type, unless overridden by `watch.intervals`
+# in the config or an `interval` on the input item itself.
+DEFAULT_INTERVALS: Dict[str, float] = {
+    "video": 3600,
+    "channel": 3600,
+    "playlist": 3600,
+    "search": 900,
+    "trending": 300,
+}
+
+ProcessFn = Callable[[Any, Dict[str, Any]], Optional[List[Dict[str, Any]]]]
+
+def _interval_for(item: Dict[str, Any], watch_cfg: Dict[str, Any]) -> float:
+    if "interval" in item:
+        interval = float(item["interval"])
+    else:
+        intervals = {**DEFAULT_INTERVALS, **watch_cfg.get("intervals", {})}
+        scrape_type = (item.get("type") or "").lower()
+        interval = float(
+            intervals.get(scrape_type, watch_cfg.get("default_interval", 3600))
+        )
+    if not math.isfinite(interval) or interval <= 0:
+        raise ValueError(f"interval must be a positive number of seconds, got {interval}")
+    return interval
+
+def _next_due(now: float, interval: float, jitter: float) -> float:
+    """Spread polls by +/- `jitter` (a fraction of the interval) so inputs drift apart."""
+    return now + interval * (1 + random.uniform(-jitter, jitter))
+
+def _record_key(record: Dict[str, Any]) -> Tuple[Any, ...]:
+    # The same video can be listed under several searches or playlists.
+    return (
+        record.get("videoUrl"),
+        record.get("playlistName"),
+        record.get("searchKeyword"),
+        record.get("trendingCategory"),
+    )
+
+def changed_records(
+    records: List[Dict[str, Any]], seen: Dict[Tuple[Any, ...], bytes]
+) -> List[Dict[str, Any]]:
+    """
+    Return the records that are new or differ from the last emitted version.
+
+    `seen` maps record keys to a digest of the last emitted record and is
+    updated in place.
+    """
+    changed: List[Dict[str, Any]] = []
+    for record in records:
+        digest = hashlib.blake2b(
+            json.dumps(record, sort_keys=True, default=str).encode("utf-8"),
+            digest_size=16,
+        ).digest()
+        key = _record_key(record)
+        if seen.get(key) != digest:
+            seen[key] = digest
+            changed.append(record)
+    return changed
+
+def watch(
+    inputs: List[Any],
+    config: Dict[str, Any],
+    process: ProcessFn,
+    output_path: Path,
+    stop: Optional[threading.Event] = None,
+) -> None:
+    """
+    Poll every input at its own interval until stopped.
+
+    Inputs are re-scraped when due, hottest (highest `priority`) first when
+    several are due together. Only records that changed since they were last
+    seen are appended to `output_path` as JSON Lines. The process keeps its
+    HTTP connection pool and change cache for its whole lifetime; SIGINT or
+    SIGTERM stop it after the current input.
+    """
+    watch_cfg = config.get("watch", {})
+    jitter = float(watch_cfg.get("jitter", 0.1))
+    stop = stop or threading.Event()
+
+    # (due, -priority, index): heapq pops the earliest, then hottest, input.
+    schedule: List[Tuple[float, int, int]] = []
+    # index -> seconds between polls, validated once so rescheduling cannot fail.
+    intervals: Dict[int, float] = {}
+    now = time.monotonic()
+    for index, item in enumerate(inputs):
+        if not isinstance(item, dict):
+            logger.warning("Skipping non-object item in input: %r", item)
+            continue
+        try:
+            priority = int(item.get("priority", 0))
+            intervals[index] = _interval_for(item, watch_cfg)
+        except (TypeError, ValueError, OverflowError) as exc:
+            logger.warning(
+                "Skipping %s (%s): invalid priority or interval: %s",
+                item.get("type"),
+                item.get("url"),
+                exc,
+            )
+            continue
+        heapq.heappush(schedule, (now, -priority, index))
+
+    seen: Dict[Tuple[Any, ...], bytes] = {}
+
+    previous_handlers = {}
+    if threading.current_thread() is threading.main_thread():
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            previous_handlers[signum] = signal.signal(
+                signum, lambda *_: stop.set()
+            )
+
+    logger.info("Watching %s inputs; appending changes to %s", len(schedule), output_path)
+    try:
+        while schedule and not stop.is_set():
+            now = time.monotonic()
+            if schedule[0][0] > now:
+                stop.wait(schedule[0][0] - now)
+                continue
+
+            ready: List[Tuple[float, int, int]] = []
+            while schedule and schedule[0][0] <= now:
+                ready.append(heapq.heappop(schedule))
+            ready.sort(key=lambda entry: entry[1])
+
+            for _, neg_priority, index in ready:
+                if stop.is_set():
+                    break
+
+                item = inputs[index]
+                try:
+                    batch = process(item, config)
+                except Exception as exc:  # noqa: BLE001
+                    logger.exception(
+                        "Failed to process %s (%s): %s",
+                        item.get("type"),
+                        item.get("url"),
+                        exc,
+                    )
+                    batch = []
+
+                if batch is None:
+                    # Skipped as invalid; polling it again will not help.
+                    continue
+
+                changed = changed_records(batch, seen)
+                if changed:
+                    append_jsonl(changed, output_path)
+                logger.info(
+                    "Polled %s: %s records, %s changed",
+                    item.get("url"),
+                    len(batch),
+                    len(changed),
+                )
+
+                heapq.heappush(
+                    schedule,
+                    (
+                        _next_due(time.monotonic(), intervals[index], jitter),
+                        neg_priority,
+                        index,
+                    ),
+                )
+    finally:
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+
+    logger.info("Watch mode stopped.")